@@ -0,0 +1,166 @@
+"""Game-theoretic search over board positions, without any pygame code.
+
+A position is a flat tuple of square values (0 empty, 1 human, 2 AI) in
+row-major order, so it can be used as a dictionary key. Square boards of
+any size are supported; a player wins by filling a row, a column or one
+of the two diagonals. The human always moves first.
+"""
+import math
+import random
+from functools import lru_cache
+
+EMPTY = 0
+HUMAN = 1
+AI = 2
+
+# Results from the point of view of the side to move
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+
+def position_key(check_board):
+    return tuple(int(value) for row in check_board for value in row)
+
+
+def board_size(key):
+    return math.isqrt(len(key))
+
+
+@lru_cache(maxsize=None)
+def winning_lines(size):
+    lines = []
+    for row in range(size):
+        lines.append(tuple(row * size + col for col in range(size)))
+    for col in range(size):
+        lines.append(tuple(row * size + col for row in range(size)))
+    lines.append(tuple(i * size + i for i in range(size)))
+    lines.append(tuple(i * size + (size - 1 - i) for i in range(size)))
+    return tuple(lines)
+
+
+def winner(key):
+    for line in winning_lines(board_size(key)):
+        first = key[line[0]]
+        if first != EMPTY and all(key[i] == first for i in line):
+            return first
+    return EMPTY
+
+
+def side_to_move(key):
+    return HUMAN if key.count(HUMAN) == key.count(AI) else AI
+
+
+def is_terminal(key):
+    return winner(key) != EMPTY or EMPTY not in key
+
+
+def play(key, square, player):
+    return key[:square] + (player,) + key[square + 1:]
+
+
+def rank(outcome):
+    # Win as fast as possible, lose or draw as slowly as possible
+    result, distance = outcome
+    return (result, -distance if result == WIN else distance)
+
+
+@lru_cache(maxsize=None)
+def solve(key):
+    """Return (result, distance) for the side to move with perfect play.
+
+    distance is the number of plies until the game ends.
+    """
+    if winner(key) != EMPTY:
+        return (LOSS, 0)  # The previous move won
+    if EMPTY not in key:
+        return (DRAW, 0)
+    player = side_to_move(key)
+    best = None
+    for square, value in enumerate(key):
+        if value == EMPTY:
+            result, distance = solve(play(key, square, player))
+            outcome = (-result, distance + 1)
+            if best is None or rank(outcome) > rank(best):
+                best = outcome
+    return best
+
+
+def analyse(key):
+    """Return {square: (result, distance)} for every move of the side to move."""
+    if is_terminal(key):
+        return {}
+    player = side_to_move(key)
+    moves = {}
+    for square, value in enumerate(key):
+        if value == EMPTY:
+            result, distance = solve(play(key, square, player))
+            moves[square] = (-result, distance + 1)
+    return moves
+
+
+def choose_move(key):
+    """Return the best square for the side to move, or None if the game is over."""
+    moves = analyse(key)
+    if not moves:
+        return None
+    return max(moves, key=lambda square: rank(moves[square]))
+
+
+@lru_cache(maxsize=None)
+def symmetries(size):
+    # Each symmetry maps a square of the transformed board to the original square
+    squares = [(row, col) for row in range(size) for col in range(size)]
+    transforms = []
+    for flip in (False, True):
+        for turns in range(4):
+            permutation = []
+            for row, col in squares:
+                if flip:
+                    col = size - 1 - col
+                for _ in range(turns):
+                    row, col = col, size - 1 - row
+                permutation.append(row * size + col)
+            transforms.append(tuple(permutation))
+    return tuple(dict.fromkeys(transforms))
+
+
+def canonical(key):
+    """Return (canonical key, symmetry) where canonical[i] == key[symmetry[i]]."""
+    return min((tuple(key[i] for i in symmetry), symmetry)
+               for symmetry in symmetries(board_size(key)))
+
+
+def reachable_positions(size=3):
+    """Return every non-terminal position that can come up in a game."""
+    start = (EMPTY,) * (size * size)
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for key in frontier:
+            if is_terminal(key):
+                continue
+            player = side_to_move(key)
+            for square, value in enumerate(key):
+                if value == EMPTY:
+                    child = play(key, square, player)
+                    if child not in seen:
+                        seen.add(child)
+                        next_frontier.append(child)
+        frontier = next_frontier
+    return sorted(key for key in seen if not is_terminal(key))
+
+
+def random_positions(size, games, empties, seed=0):
+    """Return the non-terminal positions random games reach with `empties` squares left."""
+    rng = random.Random(seed)
+    positions = set()
+    for _ in range(games):
+        key = (EMPTY,) * (size * size)
+        while key.count(EMPTY) > empties and not is_terminal(key):
+            square = rng.choice([i for i, value in enumerate(key) if value == EMPTY])
+            key = play(key, square, side_to_move(key))
+        if not is_terminal(key):
+            positions.add(key)
+    return sorted(positions)
@@ -0,0 +1,22 @@
+"""Run the game's code without a window, on a pool of worker processes.
+
+Importing this module selects SDL's dummy video driver, so it must be
+imported before main (which opens the display on import).
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import multiprocessing
+
+
+def map_in_workers(function, jobs, workers=None, chunksize=1):
+    """Return [function(job) for job in jobs], computed on worker processes."""
+    # SDL is already initialised by main, so workers must be spawned, and SDL
+    # turns SIGTERM into a quit event, so they must be left to exit on their own
+    context = multiprocessing.get_context('spawn')
+    pool = context.Pool(workers or multiprocessing.cpu_count())
+    try:
+        return pool.map(function, jobs, chunksize)
+    finally:
+        pool.close()
+        pool.join()
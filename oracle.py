@@ -0,0 +1,190 @@
+"""Local HTTP service answering "what would the AI play here?" without pygame.
+
+    python oracle.py --port 8765 --workers 4
+
+POST /move  {"board": [[0, 0, 0], [0, 1, 0], [0, 0, 0]]}
+    -> {"move": [0, 0], "result": "draw", "distance": 8}
+POST /batch {"boards": [board, board, ...]}
+    -> {"moves": [answer, answer, ...]}
+GET  /stats -> cache hits and misses
+
+Boards are 3x3, as nested lists or flat lists of 0 (empty), 1 (human,
+moves first) and 2 (AI); the answer is for whichever side is to move. "move"
+is null once the game is over. Answers are cached per position up to
+symmetry, and positions missing from the cache are solved on a pool of
+worker processes. Connections are kept alive between requests.
+"""
+import argparse
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import engine
+
+RESULT_NAMES = {engine.WIN: "win", engine.DRAW: "draw", engine.LOSS: "loss"}
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+def parse_board(board):
+    if not isinstance(board, list):
+        raise ValueError("board must be a list")
+    if len(board) == 3 and all(isinstance(row, list) for row in board):
+        if any(len(row) != 3 for row in board):
+            raise ValueError("board must have 3 rows of 3 squares")
+        board = [value for row in board for value in row]
+    key = tuple(board)
+    # bool is a subclass of int, and JSON true would otherwise pass as 1
+    if len(key) != 9 or any(type(value) is not int or value not in (0, 1, 2) for value in key):
+        raise ValueError("board must be a 3x3 grid of 0, 1 and 2")
+    if key.count(engine.HUMAN) - key.count(engine.AI) not in (0, 1):
+        raise ValueError("the human moves first and players alternate")
+    return key
+
+
+def solve_canonical(key):
+    # Runs in a worker process: (canonical move or None, result, distance)
+    move = engine.choose_move(key)
+    if move is None:
+        return None, None, 0
+    result, distance = engine.analyse(key)[move]
+    return move, result, distance
+
+
+def format_answer(key, symmetry, solved):
+    move, result, distance = solved
+    size = engine.board_size(key)
+    if move is not None:
+        move = list(divmod(symmetry[move], size))
+    return {"move": move, "result": RESULT_NAMES.get(result), "distance": distance}
+
+
+class Oracle:
+    def __init__(self, workers=None, cache_size=100000):
+        self.cache = LRUCache(cache_size)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def answer_many(self, keys):
+        canonicals = [engine.canonical(key) for key in keys]
+        solved = {}
+        misses = []
+        for canonical_key, _ in canonicals:
+            if canonical_key in solved:
+                continue
+            cached = self.cache.get(canonical_key)
+            if cached is None:
+                misses.append(canonical_key)
+                solved[canonical_key] = None
+            else:
+                solved[canonical_key] = cached
+        if misses:
+            chunksize = max(1, len(misses) // (4 * self.workers))
+            for canonical_key, answer in zip(misses, self.pool.map(solve_canonical, misses, chunksize=chunksize)):
+                self.cache.put(canonical_key, answer)
+                solved[canonical_key] = answer
+        return [format_answer(key, symmetry, solved[canonical_key])
+                for key, (canonical_key, symmetry) in zip(keys, canonicals)]
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+class OracleHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep connections alive
+    # Headers and body go out in separate writes, which Nagle's algorithm
+    # would hold back until the client's delayed ACK on a kept-alive socket
+    disable_nagle_algorithm = True
+    oracle = None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            cache = self.oracle.cache
+            self.send_json(200, {"hits": cache.hits, "misses": cache.misses, "entries": len(cache.entries)})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:
+                # rfile.read(-1) would block until the client closes the connection,
+                # and any body left unread must not be parsed as the next request
+                self.close_connection = True
+                raise ValueError("negative Content-Length")
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if self.path == '/move':
+                answer = self.oracle.answer_many([parse_board(request["board"])])[0]
+            elif self.path == '/batch':
+                answer = {"moves": self.oracle.answer_many([parse_board(board) for board in request["boards"]])}
+            else:
+                self.send_json(404, {"error": "not found"})
+                return
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": str(e) or "bad request"})
+            return
+        self.send_json(200, answer)
+
+    def log_message(self, format, *args):
+        pass  # Per-request logging would dominate the cost of a cached answer
+
+
+def make_server(host='127.0.0.1', port=8765, workers=None, cache_size=100000):
+    oracle = Oracle(workers, cache_size)
+    handler = type('Handler', (OracleHandler,), {'oracle': oracle})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, oracle
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve AI moves over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="solver processes for cache misses (default: all cores)")
+    parser.add_argument("--cache-size", type=int, default=100000, help="positions kept in the response cache")
+    args = parser.parse_args()
+
+    server, oracle = make_server(args.host, args.port, args.workers, args.cache_size)
+    print(f"Move oracle listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        oracle.shutdown()
@@ -0,0 +1,93 @@
+"""Load generator for the move oracle (oracle.py) running on localhost.
+
+Each client thread keeps one connection open and sends positions drawn
+from every reachable 3x3 position. Reports requests/sec and p50/p99
+latency; with --batch, each request carries that many boards.
+
+    python oracle.py --port 8765 &
+    python oracle_load.py --port 8765 --clients 8 --requests 20000
+    python oracle_load.py --port 8765 --batch 1000 --requests 200
+"""
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+
+import engine
+
+
+def run_client(host, port, positions, requests, batch, seed, latencies, errors):
+    try:
+        send_requests(host, port, positions, requests, batch, seed, latencies)
+    except Exception as e:
+        errors.append(f"client {seed}: {e}")
+
+
+def send_requests(host, port, positions, requests, batch, seed, latencies):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port)
+    headers = {'Content-Type': 'application/json'}
+    for _ in range(requests):
+        if batch:
+            path = '/batch'
+            body = json.dumps({"boards": [list(rng.choice(positions)) for _ in range(batch)]})
+        else:
+            path = '/move'
+            body = json.dumps({"board": list(rng.choice(positions))})
+        start = time.perf_counter()
+        connection.request('POST', path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"oracle answered {response.status}")
+    connection.close()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure move oracle throughput and latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=10000, help="total requests across all clients")
+    parser.add_argument("--batch", type=int, default=0, help="boards per request on /batch (0 uses /move)")
+    args = parser.parse_args()
+
+    if args.clients < 1 or args.requests < args.clients:
+        parser.error("--requests must be at least --clients, and --clients at least 1")
+
+    positions = engine.reachable_positions()
+    latencies = []
+    errors = []
+    # Spread the remainder so exactly --requests requests are sent
+    per_client = [args.requests // args.clients + (seed < args.requests % args.clients)
+                  for seed in range(args.clients)]
+    threads = [threading.Thread(target=run_client,
+                                args=(args.host, args.port, positions, per_client[seed], args.batch, seed,
+                                      latencies, errors))
+               for seed in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        sys.exit(f"{len(errors)} of {args.clients} clients failed; no results reported")
+
+    latencies.sort()
+    boards = len(latencies) * max(args.batch, 1)
+    print(f"{len(latencies)} requests ({boards} boards) in {elapsed:.2f}s: "
+          f"{len(latencies) / elapsed:.0f} requests/s, {boards / elapsed:.0f} boards/s")
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
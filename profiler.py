@@ -0,0 +1,109 @@
+"""Per-frame stage timings for the in-window profiler overlay.
+
+The game loop calls mark(stage) after each piece of work, so the time
+since the previous mark is charged to that stage. Every call site is
+guarded by `if profiler.enabled`, so nothing is timed while the overlay
+is off.
+"""
+import csv
+import time
+from collections import deque
+
+import pygame
+
+# ai_delay is the deliberate pause before the AI replies and idle is the
+# wait for the next tick, both kept apart from real work
+STAGES = ('events', 'ai_delay', 'ai', 'draw_lines', 'draw_figures', 'draw_refresh_button', 'text', 'flip',
+          'overlay', 'idle')
+
+histogram_bins = 20
+histogram_bin_ms = 2  # The last bin also holds every slower frame
+panel_refresh = 0.5  # seconds between panel redraws
+
+
+class FrameProfiler:
+    def __init__(self, window=600):
+        self.enabled = False
+        self.samples = deque(maxlen=window)  # (frame seconds, {stage: seconds})
+        self.frame_start = None
+        self.last_mark = None
+        self.stages = {}
+        self.panel = None
+        self.panel_time = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        # The first frame starts at the top of the next loop iteration, so
+        # the partial frame the toggle happened in is never recorded
+        self.frame_start = None
+        self.panel = None
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.samples.append((now - self.frame_start, self.stages))
+        self.frame_start = now
+        self.last_mark = now
+        self.stages = {}
+
+    def mark(self, stage):
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0) + now - self.last_mark
+        self.last_mark = now
+
+    def dump(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'frame_ms', *(f"{stage}_ms" for stage in STAGES)])
+            for i, (frame_time, stages) in enumerate(self.samples):
+                writer.writerow([i, f"{frame_time * 1000:.3f}",
+                                 *(f"{stages.get(stage, 0) * 1000:.3f}" for stage in STAGES)])
+        return len(self.samples)
+
+    def histogram(self):
+        counts = [0] * histogram_bins
+        for frame_time, _ in self.samples:
+            counts[min(histogram_bins - 1, int(frame_time * 1000 / histogram_bin_ms))] += 1
+        return counts
+
+    def build_panel(self, font):
+        line_height = font.get_linesize()
+        panel_width = 220
+        histogram_height = 40
+        panel_height = line_height * (len(STAGES) + 1) + histogram_height + 20
+        panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+
+        frames = len(self.samples)
+        average = sum(frame_time for frame_time, _ in self.samples) / frames if frames else 0
+        fps = 1 / average if average else 0
+        rows = [(f"FPS {fps:.1f}", f"{average * 1000:.2f} ms")]
+        for stage in STAGES:
+            stage_average = sum(stages.get(stage, 0) for _, stages in self.samples) / frames if frames else 0
+            rows.append((stage, f"{stage_average * 1000:.2f} ms"))
+        for i, (name, value) in enumerate(rows):
+            y = 4 + i * line_height
+            panel.blit(font.render(name, True, (255, 255, 255)), (6, y))
+            value_surface = font.render(value, True, (255, 255, 255))
+            panel.blit(value_surface, value_surface.get_rect(topright=(panel_width - 6, y)))
+
+        # Frame-time histogram, 0 ms on the left
+        counts = self.histogram()
+        tallest = max(counts) or 1
+        bar_width = (panel_width - 12) // histogram_bins
+        bottom = panel_height - 6
+        for i, count in enumerate(counts):
+            bar_height = int(histogram_height * count / tallest)
+            if bar_height:
+                pygame.draw.rect(panel, (80, 200, 120),
+                                 (6 + i * bar_width, bottom - bar_height, bar_width - 1, bar_height))
+        return panel
+
+    def draw(self, surface, font, position):
+        now = time.perf_counter()
+        if self.panel is None or now - self.panel_time > panel_refresh:
+            self.panel = self.build_panel(font)
+            self.panel_time = now
+        surface.blit(self.panel, position)
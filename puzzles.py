@@ -0,0 +1,100 @@
+"""Mine "find the only good move" puzzles from the solved game.
+
+A position is a puzzle when the side to move has exactly one winning
+move, or cannot win and has exactly one move that avoids losing. Depth
+is the number of plies to the forced result: the win for winning
+puzzles, and the quickest loss after a wrong move for saving puzzles.
+Symmetric positions are mined once.
+
+Puzzles are appended to the output as JSON lines as soon as they are
+found. The canonical key of every classified position, puzzle or not,
+goes to <output>.seen, so a re-run skips everything already done.
+
+    python puzzles.py puzzles.jsonl
+    python puzzles.py puzzles_4x4.jsonl --size 4 --games 5000 --empties 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+import engine
+
+
+def classify(key):
+    """Return the puzzle record for a position, or None if it is not one."""
+    moves = engine.analyse(key)
+    result = max(move_result for move_result, _ in moves.values())
+    good = [square for square, (move_result, _) in moves.items() if move_result == result]
+    if len(good) != 1 or len(moves) == 1 or result == engine.LOSS:
+        return None
+    if result == engine.WIN:
+        kind = "win"
+        depth = moves[good[0]][1]
+    else:
+        kind = "save"
+        depth = min(distance for move_result, distance in moves.values() if move_result == engine.LOSS)
+    size = engine.board_size(key)
+    return {
+        "board": [list(key[row * size:(row + 1) * size]) for row in range(size)],
+        "to_move": "human" if engine.side_to_move(key) == engine.HUMAN else "ai",
+        "kind": kind,
+        "move": list(divmod(good[0], size)),
+        "depth": depth,
+    }
+
+
+def classify_chunk(keys):
+    return [(key, classify(key)) for key in keys]
+
+
+def key_text(key):
+    return ''.join(str(value) for value in key)
+
+
+def load_seen(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {tuple(int(value) for value in line.strip()) for line in f if line.strip()}
+
+
+def mine(positions, output, workers=None, chunk=256):
+    seen_path = output + '.seen'
+    seen = load_seen(seen_path)
+    todo = sorted({engine.canonical(key)[0] for key in positions} - seen)
+    chunks = [todo[i:i + chunk] for i in range(0, len(todo), chunk)]
+    found = 0
+    with multiprocessing.Pool(workers or multiprocessing.cpu_count()) as pool, \
+            open(output, 'a') as puzzles_file, open(seen_path, 'a') as seen_file:
+        for results in pool.imap_unordered(classify_chunk, chunks):
+            for key, puzzle in results:
+                if puzzle is not None:
+                    puzzles_file.write(json.dumps(puzzle) + '\n')
+                    found += 1
+            # Record progress only once the puzzles are written
+            puzzles_file.flush()
+            seen_file.write(''.join(key_text(key) + '\n' for key, _ in results))
+            seen_file.flush()
+    return len(todo), found, len(positions)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mine only-move puzzles from the solved game")
+    parser.add_argument("output", help="JSON lines file to append puzzles to")
+    parser.add_argument("--size", type=int, default=3, help="board size; above 3, random positions are sampled")
+    parser.add_argument("--games", type=int, default=1000, help="random games to sample on larger boards")
+    parser.add_argument("--empties", type=int, default=8, help="empty squares left in sampled positions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.size == 3:
+        positions = engine.reachable_positions()
+    else:
+        positions = engine.random_positions(args.size, args.games, args.empties, args.seed)
+    classified, found, total = mine(positions, args.output, args.workers)
+    print(f"Classified {classified} new positions ({total} before removing symmetries and "
+          f"earlier runs), found {found} puzzles in {time.time() - start:.2f}s")
@@ -0,0 +1,177 @@
+"""Render recorded games to PNG frame sequences without opening a window.
+
+Each line of the input file is one game: a JSON list of [row, col] moves
+(or an object with a "moves" key), played alternately starting with the
+human (X). Frames are written to <out_dir>/game_<n>/frame_<m>.png.
+Games with malformed lines, off-board or repeated squares are reported
+by index and skipped.
+
+    python replay.py games.jsonl frames/ --workers 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pygame
+
+import headless
+import main
+
+# Sprites are built once per worker process and reused for every game
+_background = None
+_cell_sprites = {}
+_status_strips = {}
+
+
+def cell_rect(row, col):
+    # Inset by the grid line width so a cell sprite never covers the grid
+    return pygame.Rect(col * main.square_size + main.line_width,
+                       main.button_area + row * main.square_size + main.line_width,
+                       main.square_size - 2 * main.line_width,
+                       main.square_size - 2 * main.line_width)
+
+
+def get_background():
+    global _background
+    if _background is None:
+        _background = pygame.Surface((main.width, main.height))
+        _background.fill(main.BG_COLOR)
+        main.draw_lines(surface=_background)
+    return _background
+
+
+def get_cell_sprite(row, col, player):
+    key = (row, col, player)
+    if key not in _cell_sprites:
+        single = np.zeros((main.board_rows, main.board_cols))
+        single[row][col] = player
+        frame = get_background().copy()
+        main.draw_figures(surface=frame, check_board=single)
+        _cell_sprites[key] = frame.subsurface(cell_rect(row, col)).copy()
+    return _cell_sprites[key]
+
+
+def get_status_strip(player, game_over, winner_line, winner_color):
+    # The status text, title and button only depend on the game state
+    key = (player, game_over, winner_line is not None, winner_color)
+    if key not in _status_strips:
+        frame = get_background().copy()
+        main.draw_status_text(surface=frame, state=(player, game_over, winner_line, winner_color))
+        main.draw_title(surface=frame)
+        main.draw_refresh_button(surface=frame)
+        _status_strips[key] = frame.subsurface((0, 0, main.width, main.button_area)).copy()
+    return _status_strips[key]
+
+
+def parse_game(line):
+    """Return the [row, col] moves of one input line, or raise ValueError."""
+    try:
+        game = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"not valid JSON: {e}")
+    if isinstance(game, dict):
+        game = game.get("moves")
+    if not isinstance(game, list):
+        raise ValueError("expected a list of [row, col] moves")
+    moves = []
+    taken = set()
+    for move in game:
+        if (not isinstance(move, list) or len(move) != 2
+                or any(type(value) is not int for value in move)):
+            raise ValueError(f"move {move!r} is not a [row, col] pair")
+        row, col = move
+        if not (0 <= row < main.board_rows and 0 <= col < main.board_cols):
+            raise ValueError(f"square ({row}, {col}) is off the board")
+        if (row, col) in taken:
+            raise ValueError(f"square ({row}, {col}) is already taken")
+        taken.add((row, col))
+        moves.append((row, col))
+    return moves
+
+
+def render_game(game_index, moves, out_dir):
+    game_dir = os.path.join(out_dir, f"game_{game_index:05d}")
+    os.makedirs(game_dir, exist_ok=True)
+
+    replay_board = np.zeros((main.board_rows, main.board_cols))
+    frame = get_background().copy()
+    player = 1
+    game_over = False
+    winner_line = None
+    winner_color = main.WHITE
+
+    frame.blit(get_status_strip(player, game_over, winner_line, winner_color), (0, 0))
+    pygame.image.save(frame, os.path.join(game_dir, "frame_000.png"))
+    frames = 1
+
+    for row, col in moves:
+        if game_over:
+            break
+        replay_board[row][col] = player
+
+        # Only the changed cell and the status strip are redrawn
+        frame.blit(get_cell_sprite(row, col, player), cell_rect(row, col))
+        if main.check_win(player, replay_board):
+            winner_line = main.get_winning_line(player, replay_board)
+            winner_color = main.GREEN if player == 1 else main.RED
+            game_over = True
+        elif main.is_board_full(replay_board):
+            winner_color = main.BLUE
+            game_over = True
+        else:
+            player = 2 if player == 1 else 1
+        frame.blit(get_status_strip(player, game_over, winner_line, winner_color), (0, 0))
+
+        if winner_line:
+            pygame.draw.line(frame, winner_color, winner_line[0], winner_line[1], main.win_line_width)
+        elif game_over:
+            main.draw_lines(color=main.BLUE, surface=frame)
+
+        pygame.image.save(frame, os.path.join(game_dir, f"frame_{frames:03d}.png"))
+        frames += 1
+    return frames
+
+
+def _render_job(job):
+    # Returns (game index, frames, error); a malformed game is skipped, not fatal
+    game_index, line, out_dir = job
+    try:
+        moves = parse_game(line)
+    except ValueError as e:
+        return game_index, 0, str(e)
+    return game_index, render_game(game_index, moves, out_dir), None
+
+
+def load_games(path):
+    # Lines are parsed in the workers so one bad line only skips its own game
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def render_all(games, out_dir, workers=None):
+    """Render every game line; return (total frames, [(game index, error)])."""
+    jobs = [(i, line, out_dir) for i, line in enumerate(games)]
+    results = headless.map_in_workers(_render_job, jobs, workers, chunksize=16)
+    errors = sorted((game_index, error) for game_index, _, error in results if error)
+    return sum(frames for _, frames, _ in results), errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render recorded games to PNG frames")
+    parser.add_argument("games", help="JSON lines file with one move list per line")
+    parser.add_argument("out_dir", help="directory to write frame sequences into")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: all cores)")
+    args = parser.parse_args()
+
+    workers = args.workers or multiprocessing.cpu_count()
+    games = load_games(args.games)
+    start = time.time()
+    total_frames, errors = render_all(games, args.out_dir, workers)
+    elapsed = time.time() - start
+    for game_index, error in errors:
+        print(f"Skipped game {game_index}: {error}")
+    print(f"Rendered {len(games) - len(errors)} games, {total_frames} frames in {elapsed:.2f}s "
+          f"({total_frames / elapsed:.0f} frames/s, {total_frames / elapsed / workers:.0f} frames/s per core)")
@@ -0,0 +1,125 @@
+"""Batched games against the AI for reinforcement-learning training.
+
+Thousands of 3x3 boards live in one NumPy array and every step is a
+handful of array operations. The agent plays the human side (1, moves
+first); the AI (2) replies from a table of engine moves precomputed for
+every board, and boards are also tracked as base-3 codes so win and
+draw checks are table lookups too.
+
+    env = VecTicTacToe(4096)
+    observations = env.reset()
+    observations, rewards, dones, info = env.step(actions)
+
+Rewards are +1 for a win, -1 for a loss or an illegal move (an occupied
+square or one outside 0-8, which also ends the game) and 0 otherwise.
+Finished boards are reset automatically; the board each game ended on
+is in info["final_observation"].
+"""
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+import engine
+
+SQUARES = 9
+POWERS = 3 ** np.arange(SQUARES, dtype=np.int32)
+
+
+@lru_cache(maxsize=None)
+def policy_tables():
+    """Return (winner, full, ai_reply) arrays indexed by base-3 board code."""
+    codes = 3 ** SQUARES
+    winner = np.zeros(codes, dtype=np.int8)
+    full = np.zeros(codes, dtype=bool)
+    ai_reply = np.full(codes, -1, dtype=np.int8)
+    for code in range(codes):
+        key = tuple(code // 3 ** i % 3 for i in range(SQUARES))
+        winner[code] = engine.winner(key)
+        full[code] = engine.EMPTY not in key
+        if key.count(engine.HUMAN) == key.count(engine.AI) + 1 and not engine.is_terminal(key):
+            ai_reply[code] = engine.choose_move(key)
+    return winner, full, ai_reply
+
+
+class VecTicTacToe:
+    def __init__(self, num_envs, illegal_reward=-1.0):
+        self.num_envs = num_envs
+        self.illegal_reward = illegal_reward
+        self.winner, self.full, self.ai_reply = policy_tables()
+        self.boards = np.zeros((num_envs, SQUARES), dtype=np.int8)
+        self.codes = np.zeros(num_envs, dtype=np.int32)
+        self.rows = np.arange(num_envs)
+
+    def reset(self):
+        self.boards[:] = 0
+        self.codes[:] = 0
+        return self.boards.copy()
+
+    def legal_moves(self):
+        return self.boards == 0
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,) or not np.issubdtype(actions.dtype, np.integer):
+            raise ValueError(f"actions must be {self.num_envs} integer squares")
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+
+        # Human move; squares outside 0-8 are illegal rather than wrapped around
+        in_range = (actions >= 0) & (actions < SQUARES)
+        actions = np.where(in_range, actions, 0)
+        legal = in_range & (self.boards[self.rows, actions] == 0)
+        rows = self.rows[legal]
+        squares = actions[legal]
+        self.boards[rows, squares] = engine.HUMAN
+        self.codes[rows] += POWERS[squares]
+        human_won = legal & (self.winner[self.codes] == engine.HUMAN)
+        dones = ~legal | human_won | self.full[self.codes]
+
+        # AI reply on every board still in play
+        rows = self.rows[~dones]
+        squares = self.ai_reply[self.codes[rows]]
+        self.boards[rows, squares] = engine.AI
+        self.codes[rows] += engine.AI * POWERS[squares]
+        ai_won = self.winner[self.codes] == engine.AI
+        dones |= ai_won | self.full[self.codes]
+
+        rewards[~legal] = self.illegal_reward
+        rewards[human_won] = 1.0
+        rewards[ai_won] = -1.0
+
+        info = {"final_observation": self.boards.copy()}
+        self.boards[dones] = 0
+        self.codes[dones] = 0
+        return self.boards.copy(), rewards, dones, info
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure vectorized environment throughput")
+    parser.add_argument("--envs", type=int, default=4096, help="boards stepped together")
+    parser.add_argument("--steps", type=int, default=2000, help="batched steps to time")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    policy_tables()
+    print(f"Built policy tables in {time.perf_counter() - start:.2f}s")
+
+    env = VecTicTacToe(args.envs)
+    observations = env.reset()
+    rng = np.random.default_rng(0)
+    step_time = 0.0
+    games = wins = losses = 0
+    for _ in range(args.steps):
+        # A random legal move per board
+        actions = np.argmax(rng.random((args.envs, SQUARES)) * (observations == 0), axis=1)
+        start = time.perf_counter()
+        observations, rewards, dones, info = env.step(actions)
+        step_time += time.perf_counter() - start
+        games += int(dones.sum())
+        wins += int((rewards > 0).sum())
+        losses += int((rewards < 0).sum())
+
+    steps = args.envs * args.steps
+    print(f"{steps} environment steps in {step_time:.2f}s: {steps / step_time / 1e6:.1f}M steps/s")
+    print(f"{games} games finished: {wins} random-agent wins, {losses} losses")
@@ -0,0 +1,146 @@
+"""Check a candidate engine against the game's own minimax search.
+
+Every reachable 3x3 position is compared against a reference built from
+minimax_ab, the search behind best_move. For each position the candidate
+must agree on the result for the side to move (win, draw or loss) and on
+the set of moves that keep that result. minimax_ab does not distinguish
+fast wins from slow ones, so neither does the comparison. Larger boards
+are checked on positions sampled from random games, against a plain
+alpha-beta search with the same rules.
+
+A candidate is any function that takes a position tuple (see engine.py)
+and returns (result, moves):
+
+    python verify_engine.py
+    python verify_engine.py --candidate my_engine:evaluate --workers 8
+    python verify_engine.py --size 4 --games 200 --empties 8
+"""
+import argparse
+import importlib
+import sys
+import time
+
+import numpy as np
+
+import engine
+import headless
+import main
+
+
+def engine_candidate(key):
+    moves = engine.analyse(key)
+    result = max(result for result, _ in moves.values())
+    return result, {square for square, (move_result, _) in moves.items() if move_result == result}
+
+
+def load_candidate(spec):
+    module_name, function_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def result_for(score, player):
+    # minimax_ab scores +inf for an AI win and -inf for a human win
+    if score == 0:
+        return engine.DRAW
+    winner = engine.AI if score > 0 else engine.HUMAN
+    return engine.WIN if winner == player else engine.LOSS
+
+
+def reference_3x3(key):
+    player = engine.side_to_move(key)
+    check_board = np.array(key, dtype=float).reshape(main.board_rows, main.board_cols)
+    moves = {}
+    for square, value in enumerate(key):
+        if value == engine.EMPTY:
+            row, col = divmod(square, main.board_cols)
+            check_board[row][col] = player
+            # After the human moves the AI (the maximizer) is to play
+            score = main.minimax_ab(check_board, 0, player == engine.HUMAN, float('-inf'), float('inf'))
+            check_board[row][col] = 0
+            moves[square] = result_for(score, player)
+    result = max(moves.values())
+    return result, {square for square, move_result in moves.items() if move_result == result}
+
+
+def alpha_beta(key, alpha, beta):
+    # Plain fail-hard negamax with the engine's rules, used for larger boards
+    if engine.winner(key) != engine.EMPTY:
+        return engine.LOSS
+    if engine.EMPTY not in key:
+        return engine.DRAW
+    player = engine.side_to_move(key)
+    for square, value in enumerate(key):
+        if value == engine.EMPTY:
+            score = -alpha_beta(engine.play(key, square, player), -beta, -alpha)
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+    return alpha
+
+
+def reference_any(key):
+    player = engine.side_to_move(key)
+    moves = {}
+    for square, value in enumerate(key):
+        if value == engine.EMPTY:
+            moves[square] = -alpha_beta(engine.play(key, square, player), engine.LOSS, engine.WIN)
+    result = max(moves.values())
+    return result, {square for square, move_result in moves.items() if move_result == result}
+
+
+def check_positions(job):
+    positions, candidate_spec = job
+    candidate = load_candidate(candidate_spec)
+    reference = reference_3x3 if len(positions[0]) == 9 else reference_any
+    mismatches = []
+    reference_time = 0.0
+    candidate_time = 0.0
+    for key in positions:
+        start = time.perf_counter()
+        expected = reference(key)
+        reference_time += time.perf_counter() - start
+        start = time.perf_counter()
+        result, moves = candidate(key)
+        candidate_time += time.perf_counter() - start
+        if (result, set(moves)) != expected:
+            mismatches.append((key, expected, (result, set(moves))))
+    return mismatches, reference_time, candidate_time
+
+
+def verify(positions, candidate_spec='verify_engine:engine_candidate', workers=None, chunk=64):
+    # Interleave positions so the expensive early ones spread over workers
+    jobs = [(positions[i::len(positions) // chunk + 1], candidate_spec)
+            for i in range(len(positions) // chunk + 1)]
+    jobs = [job for job in jobs if job[0]]
+    results = headless.map_in_workers(check_positions, jobs, workers)
+    mismatches = [mismatch for job_mismatches, _, _ in results for mismatch in job_mismatches]
+    reference_time = sum(reference_time for _, reference_time, _ in results)
+    candidate_time = sum(candidate_time for _, _, candidate_time in results)
+    return mismatches, reference_time, candidate_time
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Verify a candidate engine against the minimax reference")
+    parser.add_argument("--candidate", default="verify_engine:engine_candidate",
+                        help="module:function returning (result, moves) for a position (default: engine.py)")
+    parser.add_argument("--size", type=int, default=3, help="board size; above 3, random positions are sampled")
+    parser.add_argument("--games", type=int, default=100, help="random games to sample on larger boards")
+    parser.add_argument("--empties", type=int, default=8, help="empty squares left in sampled positions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.size == 3:
+        positions = engine.reachable_positions()
+    else:
+        positions = engine.random_positions(args.size, args.games, args.empties, args.seed)
+    start = time.time()
+    mismatches, reference_time, candidate_time = verify(positions, args.candidate, args.workers)
+    elapsed = time.time() - start
+
+    for key, expected, actual in mismatches[:10]:
+        print(f"MISMATCH {key}: reference {expected}, candidate {actual}")
+    print(f"Checked {len(positions)} positions in {elapsed:.1f}s: {len(mismatches)} mismatches")
+    print(f"Reference {reference_time:.2f}s, candidate {candidate_time:.2f}s, "
+          f"candidate is {reference_time / max(candidate_time, 1e-9):.1f}x faster")
+    sys.exit(1 if mismatches else 0)